@@ -1,25 +1,103 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
 import base64
-import plotly.graph_objects as go
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from diskcache import Cache
+from typing import NamedTuple
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_DOWNLOAD_WORKERS = 16
+# Seconds to wait for GitHub to connect or send more data before a download is reported as failed
+DOWNLOAD_TIMEOUT = 10
+
+# Known column types of the exported CSVs, the pyarrow parser skips inferring them.
+# Timecodes fit in float32 and the few distinct codes are stored once as categories
+_SCHEMA = {"code": "category", "start": "float32", "end": "float32"}
+
+# Matchday files are named after their round, e.g. "#12.csv"
+_ROUND_RE = re.compile(r"#(\d+)\.csv$")
+
+# Layout shared by the charts, and a chart config without the plotly toolbar
+BASE_LAYOUT = {"template": "plotly_white"}
+CHART_CONFIG = {"displayModeBar": False}
+
+# Training session blocks and the categories timed inside each block
+TRAINING_BLOCKS = ("Warm Up (S)", "Block 1 (S)", "Block 2 (S)", "Block 3 (S)", "Block 4 (S)", "Block 5 (S)", "Individual (S)")
+TRAINING_CATEGORIES = ("Organization", "Coaching", "Active")
+
+# Shared HTTP session, keeps the connections to GitHub alive between downloads.
+# Every rerun executes the script anew, so it is created once as a cached resource
+@st.cache_resource
+def _session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_DOWNLOAD_WORKERS))
+    return session
 
 # ------------------------------
 # Cache helper functions
 # ------------------------------
 @st.cache_data
 def get_base64_of_bin_file(bin_file):
-    response = requests.get(bin_file)
-    data = response.content
-    return base64.b64encode(data).decode()
+    with _session().get(bin_file, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raw.decode_content = True
+        return base64.b64encode(response.raw.read()).decode()
 
-@st.cache_data
+# Last ETag and parsed frame per CSV, shared by all sessions
+@st.cache_resource
+def _csv_store():
+    return {}
+
+@st.cache_data(ttl=3600, show_spinner=False)
 def load_csv_from_github(url):
+    store = _csv_store()
+    etag, cached_df = store.get(url, (None, None))
     try:
-        return pd.read_csv(url)
+        # Revalidate with the last ETag, an unchanged file comes back as an empty 304
+        headers = {"If-None-Match": etag} if etag else {}
+        # Parse straight from the socket instead of buffering the whole body first
+        with _session().get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 304:
+                return cached_df.copy()
+            response.raise_for_status()
+            if url.endswith(".parquet"):
+                # Parquet needs a seekable file, the compressed columns are small enough to buffer
+                df = pd.read_parquet(io.BytesIO(response.content))
+            else:
+                response.raw.decode_content = True
+                df = pd.read_csv(response.raw, engine="pyarrow", dtype=_SCHEMA)
     except Exception as e:
         st.error(f"Could not load {url}. Error: {e}")
         return None
+    # The stored frame is shared by all sessions, callers get their own copy to modify
+    store[url] = (response.headers.get("ETag"), df.copy())
+    return df
+
+# ETag of the last download of a CSV, it changes whenever the file content does
+def _csv_etag(url):
+    return _csv_store().get(url, (None, None))[0]
+
+# Parse an uploaded file once, widget changes rerun the page with the same bytes
+@st.cache_data
+def load_uploaded_file(data, file_name):
+    if file_name.endswith(".parquet"):
+        df = pd.read_parquet(io.BytesIO(data))
+    else:
+        df = pd.read_csv(io.BytesIO(data), engine="pyarrow")
+
+    # The export has ~100 per-player stat columns, narrower types halve what every rerun copies and sends
+    float_cols = df.select_dtypes("float").columns
+    int_cols = df.select_dtypes("integer").columns
+    df[float_cols] = df[float_cols].apply(pd.to_numeric, downcast="float")
+    df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast="integer")
+    return df
 
 # Background styling
 def set_png_as_page_bg(png_file):
@@ -35,106 +113,195 @@ def set_png_as_page_bg(png_file):
     '''
     st.markdown(page_bg_img, unsafe_allow_html=True)
 
+# Folder listings are also kept on disk for an hour, so they survive app restarts
+# instead of spending another GitHub API call from the rate limit. The cache is opened
+# once as a cached resource rather than reconnecting to its database on every rerun
+@st.cache_resource
+def _listing_cache():
+    return Cache(os.path.join(tempfile.gettempdir(), "gh_cache"))
+
+def _list_dir(api_url):
+    listing_cache = _listing_cache()
+    names = listing_cache.get(api_url)
+    if names is not None:
+        return names
+
+    # Revalidate an expired listing with its ETag, GitHub does not count 304 answers against the rate limit
+    etag, names = listing_cache.get(("etag", api_url), (None, None))
+    headers = {"Accept": "application/vnd.github+json"}
+    if etag:
+        headers["If-None-Match"] = etag
+    response = _session().get(api_url, headers=headers, timeout=5)
+    if response.status_code != 304:
+        response.raise_for_status()
+        names = [f["name"] for f in response.json()]
+        listing_cache.set(("etag", api_url), (response.headers.get("ETag"), names))
+    listing_cache.set(api_url, names, expire=3600)
+    return names
+
+# Sessions converted by convert_training_to_parquet.py are read from their Parquet copy
+def _prefer_parquet(files):
+    converted = {f.removesuffix(".parquet") for f in files if f.endswith(".parquet")}
+    return [
+        f.removesuffix(".csv") + ".parquet" if f.removesuffix(".csv") in converted else f
+        for f in files if f.endswith(".csv")
+    ]
+
 # Fetch available files from GitHub folder
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_available_files_from_github(folder_url):
-    response = requests.get(folder_url)
-    if response.status_code == 200:
-        files = response.json()
-        csv_files = [f["name"] for f in files if f["name"].endswith(".csv")]
-        return csv_files
-    else:
-        st.error(f"Could not access GitHub folder. Error code: {response.status_code}")
+    try:
+        files = _list_dir(folder_url)
+    except requests.HTTPError as e:
+        st.error(f"Could not access GitHub folder. Error code: {e.response.status_code}")
+        return []
+    except requests.RequestException as e:
+        st.error(f"Could not access GitHub folder. Error: {e}")
         return []
+    return _prefer_parquet(files)
+
+# Per-round summary shared by every match visualization
+class RoundsData(NamedTuple):
+    combined_df: pd.DataFrame
+    active_times: pd.Series
+    dead_times: pd.Series
+    total_times: pd.Series
+    rounds: list
+    pivot: pd.DataFrame
+    source: tuple
+
+# Times are averaged over the number of files when several rounds are combined,
+# source holds the ETags of the files the rounds were read from
+def summarize_rounds(combined_df, source, n_files=1):
+    # Sort the rounds once, the ordered categorical keeps them in order from here on
+    rounds = sorted(combined_df["ROUND"].unique())
+    combined_df["ROUND"] = pd.Categorical(combined_df["ROUND"], categories=rounds, ordered=True)
+
+    # Total seconds per round and code in one pass, every chart reads from this
+    duration = combined_df["end"] - combined_df["start"]
+    pivot = duration.groupby([combined_df["ROUND"], combined_df["code"]], observed=True).sum().unstack("code", fill_value=0)
+    sequence_times = pivot.reindex(columns=["Active", "Dead"], fill_value=0) / n_files
+    active_times = sequence_times["Active"]
+    dead_times = sequence_times["Dead"]
+    total_times = active_times.add(dead_times, fill_value=0)
+    return RoundsData(combined_df, active_times, dead_times, total_times, rounds, pivot, source)
+
+# Load every available round for a team
+def load_all_rounds(team_choice):
+    available_files = [
+        file for file in get_available_files_from_github(
+            f"https://api.github.com/repos/Vangelis19/DBU-Divisionen/contents/25_26/Matchdays/{team_choice}"
+        )
+        if _ROUND_RE.match(file)
+    ]
+    if not available_files:
+        st.warning("No CSV files found in the GitHub repo for this team.")
+        return None
+    return combine_rounds(team_choice, tuple(sorted(available_files)))
 
-# ------------------------------
-# Page 1: Match Analysis Stats
-# ------------------------------
-def match_analysis_page():
-    st.subheader("📊 Match Analysis Stats")
+# The combined rounds are kept per team and file list and handed out by reference
+# instead of being unpickled on every rerun, callers must treat them as read-only
+@st.cache_resource(ttl=3600)
+def combine_rounds(team_choice, files):
+    base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Matchdays/{team_choice}"
 
-    team_choice = st.selectbox("Select Team", ["U17", "U19"])
-    round_options = list(range(1, 31)) + ["All rounds"]
-    round_choice = st.selectbox("Select Round", round_options)
+    def fetch_round(file):
+        file_url = f"{base_url}/{quote(file)}"
+        return int(_ROUND_RE.match(file).group(1)), load_csv_from_github(file_url), _csv_etag(file_url)
 
-    base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Matchdays/{team_choice}"
+    # Download the rounds concurrently, each fetch is mostly waiting on the network
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        results = list(executor.map(fetch_round, files))
 
     dfs = []
-    if round_choice == "All rounds":
-        available_files = get_available_files_from_github(
-            f"https://api.github.com/repos/Vangelis19/DBU-Divisionen/contents/25_26/Matchdays/{team_choice}"
-        )
-        if not available_files:
-            st.warning("No CSV files found in the GitHub repo for this team.")
-            return
-
-        for file in available_files:
-            file_url = f"{base_url}/{file.replace('#','%23')}"
-            df = load_csv_from_github(file_url)
-            if df is not None:
-                df["ROUND"] = int(file.strip(".csv").replace("#",""))
-                dfs.append(df)
-        
-        if dfs:
-            combined_df = pd.concat(dfs, ignore_index=True)
-            st.dataframe(combined_df)
-        else:
-            st.warning("No valid CSV files could be loaded.")
-            return
-    else:
-        csv_url = f"{base_url}/%23{round_choice}.csv"
-        df = load_csv_from_github(csv_url)
+    for round_number, df, _ in results:
         if df is not None:
-            df["ROUND"] = round_choice
-            combined_df = df
-            st.dataframe(combined_df)
-        else:
-            return
-
-    # --- Visualization 1: Total Active vs Dead Time ---
-    def compute_sequence_time(df, sequence_type):
-        seq_df = df[df["code"] == sequence_type].copy()
-        seq_df["DURATION"] = seq_df["end"] - seq_df["start"]
-        return seq_df.groupby("ROUND")["DURATION"].sum()
+            df["ROUND"] = round_number
+            dfs.append(df)
 
-    active_times = compute_sequence_time(combined_df, "Active")
-    dead_times = compute_sequence_time(combined_df, "Dead")
-
-    if round_choice == "All rounds":
-        n_files = len(get_available_files_from_github(
-            f"https://api.github.com/repos/Vangelis19/DBU-Divisionen/contents/25_26/Matchdays/{team_choice}"
-        ))
-        active_times = active_times / n_files
-        dead_times = dead_times / n_files
+    if not dfs:
+        st.warning("No valid CSV files could be loaded.")
+        return None
+    combined_df = pd.concat(dfs, ignore_index=True)
+    # Concatenating categoricals with different categories falls back to object
+    combined_df["code"] = combined_df["code"].astype("category")
+    source = tuple(zip(files, (etag for _, _, etag in results)))
+    return summarize_rounds(combined_df, source, len(files))
+
+# A single round is summarized once per team and round, reruns reuse its pivot
+@st.cache_resource(ttl=3600)
+def load_round(team_choice, round_choice):
+    base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Matchdays/{team_choice}"
+    file_url = f"{base_url}/%23{round_choice}.csv"
+    df = load_csv_from_github(file_url)
+    if df is None:
+        return None
+    df["ROUND"] = round_choice
+    return summarize_rounds(df, _csv_etag(file_url))
 
-    rounds = sorted(combined_df["ROUND"].unique())
+# Figures only depend on the team, round and the files behind them, reruns with the same selection reuse them
+@st.cache_resource(ttl=3600)
+def build_match_figures(team_choice, round_choice, source, _data):
+    # Imported on first use, the player page never loads plotly
+    import plotly.graph_objects as go
+    active_times, dead_times, rounds = _data.active_times, _data.dead_times, _data.rounds
 
-    fig1 = go.Figure()
-    fig1.add_trace(go.Bar(
-        x=rounds,
-        y=[active_times.get(r, 0)/60 for r in rounds],
-        name="Active",
-        marker_color="green",
-        text=[f"{round(active_times.get(r, 0)/60, 1)} min" for r in rounds],
-        textposition='auto'
-    ))
-    fig1.add_trace(go.Bar(
-        x=rounds,
-        y=[dead_times.get(r, 0)/60 for r in rounds],
-        name="Dead",
-        marker_color="lightcoral",
-        text=[f"{round(dead_times.get(r, 0)/60, 1)} min" for r in rounds],
-        textposition='auto'
-    ))
+    # --- Visualization 1: Total Active vs Dead Time ---
+    active_minutes = (active_times.reindex(rounds, fill_value=0) / 60).to_numpy()
+    dead_minutes = (dead_times.reindex(rounds, fill_value=0) / 60).to_numpy()
+
+    fig1 = go.Figure(data=[
+        go.Bar(
+            x=rounds,
+            y=active_minutes,
+            name="Active",
+            marker_color="green",
+            text=np.char.add(np.round(active_minutes, 1).astype(str), " min"),
+            textposition='auto'
+        ),
+        go.Bar(
+            x=rounds,
+            y=dead_minutes,
+            name="Dead",
+            marker_color="lightcoral",
+            text=np.char.add(np.round(dead_minutes, 1).astype(str), " min"),
+            textposition='auto'
+        )
+    ])
 
     fig1.update_layout(
         title="⏱️ Total Active vs Dead Sequence Time per Round (minutes)",
         xaxis_title="Round",
         yaxis_title="Time (minutes)",
         barmode="group",
-        template="plotly_white"
+        **BASE_LAYOUT
     )
-    st.plotly_chart(fig1)
+
+    return [fig1]
+
+# ------------------------------
+# Page 1: Match Analysis Stats
+# ------------------------------
+def match_analysis_page():
+    st.subheader("📊 Match Analysis Stats")
+
+    team_choice = st.selectbox("Select Team", ["U17", "U19"])
+    round_options = list(range(1, 31)) + ["All rounds"]
+    round_choice = st.selectbox("Select Round", round_options)
+
+    if round_choice == "All rounds":
+        data = load_all_rounds(team_choice)
+    else:
+        data = load_round(team_choice, round_choice)
+    if data is None:
+        return
+
+    combined_df = data.combined_df
+    st.dataframe(combined_df)
+
+    for fig in build_match_figures(team_choice, round_choice, data.source, data):
+        st.plotly_chart(fig, config=CHART_CONFIG)
 
 # ------------------------------
 # Page 2: Training Analysis Stats
@@ -155,120 +322,117 @@ def training_analysis_page():
     # File selection
     file_choice = st.selectbox("Select a file", csv_files)
     base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Training_Sessions/{team}"
-    csv_url = f"{base_url}/{file_choice.replace(' ', '%20')}"
+    csv_url = f"{base_url}/{quote(file_choice)}"
     df = load_csv_from_github(csv_url)
 
     if df is not None:
         st.dataframe(df)
-        training_visualizations(df)
+        training_visualizations(team, file_choice, _csv_etag(csv_url), df)
 
 # ------------------------------
 # Training visualizations helper
 # ------------------------------
-def training_visualizations(df):
-    st.subheader("⏱️ Block Durations (minutes)")
-    blocks = ["Warm Up (S)", "Block 1 (S)", "Block 2 (S)", "Block 3 (S)", "Block 4 (S)", "Block 5 (S)", "Individual (S)"]
-
-    durations_minutes = {}
-    for block in blocks:
-        block_df = df[df["code"] == block].copy()
-        if not block_df.empty:
-            block_df["duration_sec"] = block_df["end"] - block_df["start"]
-            durations_minutes[block] = block_df["duration_sec"].sum() / 60
-        else:
-            durations_minutes[block] = 0
-
-    session_df = df[df["code"] == "Session (S)"].copy()
-    session_minutes = 0
-    if not session_df.empty:
-        session_df["duration_sec"] = session_df["end"] - session_df["start"]
-        session_minutes = session_df["duration_sec"].sum() / 60
-
-    # Pie chart
+# Training figures only depend on the team, file and its ETag, reruns with the same selection reuse them
+@st.cache_resource(ttl=3600)
+def build_training_figures(team, file_choice, etag, _df):
+    # Imported on first use, the player page never loads plotly
+    import plotly.graph_objects as go
+    # Sessions without any block rows have nothing to chart, skip the aggregation
+    if not _df["code"].isin(TRAINING_BLOCKS).any():
+        return None
+
+    # Seconds per row, computed once and reused by every chart below
+    duration = _df["end"].to_numpy() - _df["start"].to_numpy()
+
+    # Seconds per code in a single pass: each row adds its duration to the bin of its code
+    code_order = TRAINING_BLOCKS + ("Session (S)",) + TRAINING_CATEGORIES
+    code_ids = pd.Categorical(_df["code"], categories=code_order).codes
+    totals = np.bincount(code_ids + 1, weights=duration, minlength=len(code_order) + 1)[1:] / 60
+
+    # Blocks, session and categories are consecutive slices of the totals
+    n_blocks = len(TRAINING_BLOCKS)
+    block_minutes = totals[:n_blocks]
+    session_minutes = totals[n_blocks]
+    category_minutes = totals[n_blocks + 1:]
+
+    # Pie chart, the block totals go to plotly as a NumPy array rather than a list of floats
     fig_pie = go.Figure(data=[go.Pie(
-        labels=list(durations_minutes.keys()),
-        values=list(durations_minutes.values()),
+        labels=TRAINING_BLOCKS,
+        values=block_minutes,
         hole=.3
     )])
     fig_pie.update_layout(title="🥧 Distribution of Training Blocks (minutes)")
 
     # Bar chart total vs session
     fig_bar = go.Figure(data=[
-        go.Bar(name="Sum of Blocks", x=["Total"], y=[sum(durations_minutes.values())]),
+        go.Bar(name="Sum of Blocks", x=["Total"], y=[block_minutes.sum()]),
         go.Bar(name="Session", x=["Total"], y=[session_minutes])
     ])
     fig_bar.update_layout(title="📊 Total Training Time: Sum of Blocks vs Session", barmode="group")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        st.plotly_chart(fig_pie, use_container_width=True)
-    with col2:
-        st.plotly_chart(fig_bar, use_container_width=True)
-
     # Organization vs Coaching vs Active
-    st.subheader("📊 Organization vs Coaching vs Active")
-    categories = ["Organization", "Coaching", "Active"]
-    category_minutes = {}
-    for cat in categories:
-        cat_df = df[df["code"] == cat].copy()
-        if not cat_df.empty:
-            cat_df["duration_sec"] = cat_df["end"] - cat_df["start"]
-            category_minutes[cat] = cat_df["duration_sec"].sum() / 60
-        else:
-            category_minutes[cat] = 0
-
     fig_cat = go.Figure(go.Bar(
-        x=list(category_minutes.keys()),
-        y=list(category_minutes.values()),
-        text=[f"{round(v,1)} min" for v in category_minutes.values()],
+        x=TRAINING_CATEGORIES,
+        y=category_minutes,
+        text=[f"{round(v,1)} min" for v in category_minutes],
         textposition="auto",
         marker_color=["orange", "blue", "green"]
     ))
-    fig_cat.update_layout(title="📊 Organization vs Coaching vs Active Time (minutes)", yaxis_title="Minutes", template="plotly_white")
-    st.plotly_chart(fig_cat, use_container_width=True)
+    fig_cat.update_layout(title="📊 Organization vs Coaching vs Active Time (minutes)", yaxis_title="Minutes", **BASE_LAYOUT)
 
     # Grouped bar chart per block — FIXED
-    st.subheader("📊 Organization, Coaching, and Active per Block")
-    data_by_block = {cat: [] for cat in categories}
-
-    for i, block in enumerate(blocks):
-        # Find start index of this block
-        block_indices = df.index[df["code"] == block].tolist()
-        if not block_indices:
-            for cat in categories:
-                data_by_block[cat].append(0)
-            continue
-
-        start_idx = block_indices[0]
-        # Determine end index (either next block or end of dataframe)
-        if i + 1 < len(blocks):
-            next_block_indices = df.index[df["code"] == blocks[i + 1]].tolist()
-            end_idx = next_block_indices[0] if next_block_indices else len(df)
-        else:
-            end_idx = len(df)
-
-        block_df = df.iloc[start_idx:end_idx].copy()
-        block_df["duration_sec"] = block_df["end"] - block_df["start"]
-
-        for cat in categories:
-            cat_duration = block_df[block_df["code"] == cat]["duration_sec"].sum() / 60
-            data_by_block[cat].append(cat_duration)
-
-    fig_grouped = go.Figure()
-    for cat in categories:
-        fig_grouped.add_trace(go.Bar(
-            x=blocks,
-            y=data_by_block[cat],
+    # Each row belongs to the last block that started above it
+    codes = _df["code"].to_numpy()
+    block_positions = np.flatnonzero(_df["code"].isin(TRAINING_BLOCKS).to_numpy())
+    block_starts = pd.Series(block_positions, index=codes[block_positions])
+    block_starts = block_starts[~block_starts.index.duplicated()].sort_values()
+    block_id = np.searchsorted(block_starts.to_numpy(), np.arange(len(_df)), side="right") - 1
+    in_block = block_id >= 0
+
+    data_by_block = (
+        (pd.Series(duration[in_block]) / 60)
+        .groupby([block_starts.index[block_id[in_block]], codes[in_block]])
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=TRAINING_BLOCKS, columns=TRAINING_CATEGORIES, fill_value=0)
+    )
+
+    fig_grouped = go.Figure(data=[
+        go.Bar(
+            x=TRAINING_BLOCKS,
+            y=data_by_block[cat].to_numpy(),
             name=cat
-        ))
+        )
+        for cat in TRAINING_CATEGORIES
+    ])
 
     fig_grouped.update_layout(
         title="📊 Organization, Coaching, and Active Time per Block (minutes)",
         yaxis_title="Minutes",
         barmode="group",
-        template="plotly_white"
+        **BASE_LAYOUT
     )
-    st.plotly_chart(fig_grouped, use_container_width=True)
+    return fig_pie, fig_bar, fig_cat, fig_grouped
+
+def training_visualizations(team, file_choice, etag, df):
+    figures = build_training_figures(team, file_choice, etag, df)
+    if figures is None:
+        st.info("No training blocks found in this file.")
+        return
+    fig_pie, fig_bar, fig_cat, fig_grouped = figures
+
+    st.subheader("⏱️ Block Durations (minutes)")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(fig_pie, use_container_width=True, config=CHART_CONFIG)
+    with col2:
+        st.plotly_chart(fig_bar, use_container_width=True, config=CHART_CONFIG)
+
+    st.subheader("📊 Organization vs Coaching vs Active")
+    st.plotly_chart(fig_cat, use_container_width=True, config=CHART_CONFIG)
+
+    st.subheader("📊 Organization, Coaching, and Active per Block")
+    st.plotly_chart(fig_grouped, use_container_width=True, config=CHART_CONFIG)
 
 # ------------------------------
 # Page 3: Player Data Explorer
@@ -276,22 +440,26 @@ def training_visualizations(df):
 def player_data_page():
     st.subheader("🧑‍💻 Player Data Explorer")
 
-    csv_file = st.file_uploader("Upload a CSV file", type=["csv"])
-    if csv_file is not None:
-        df = pd.read_csv(csv_file)
-        df["TEAM_FILTER"] = df["TEAMNAME"].str.replace("U17", "", regex=False).str.strip()
-        team_options = ["ALL"] + sorted(df["TEAM_FILTER"].unique().tolist())
+    uploaded_file = st.file_uploader("Upload a CSV or Parquet file", type=["csv", "parquet"])
+    if uploaded_file is not None:
+        df = load_uploaded_file(uploaded_file.getvalue(), uploaded_file.name)
+        # Only a handful of teams and positions, as categories the filters compare integer codes
+        df["TEAM_FILTER"] = df["TEAMNAME"].str.replace("U17", "", regex=False).str.strip().astype("category")
+        df["POSITION"] = df["POSITION"].astype("category")
+        # The categories are the sorted distinct values, no scan of the column needed
+        team_options = ["ALL"] + df["TEAM_FILTER"].cat.categories.tolist()
         team_choice = st.selectbox("Select Team", team_options)
-        position_options = ["ALL"] + sorted(df["POSITION"].unique().tolist())
+        position_options = ["ALL"] + df["POSITION"].cat.categories.tolist()
         position_choice = st.selectbox("Select Position", position_options)
 
-        filtered_df = df.copy()
+        # Both filters go into one mask, so the rows are selected in a single pass
+        mask = np.ones(len(df), dtype=bool)
         if team_choice != "ALL":
-            filtered_df = filtered_df[filtered_df["TEAM_FILTER"] == team_choice]
+            mask &= (df["TEAM_FILTER"] == team_choice).to_numpy()
         if position_choice != "ALL":
-            filtered_df = filtered_df[filtered_df["POSITION"] == position_choice]
+            mask &= (df["POSITION"] == position_choice).to_numpy()
 
-        st.dataframe(filtered_df)
+        st.dataframe(df if mask.all() else df[mask])
 
 # ------------------------------
 # Main App
@@ -0,0 +1,20 @@
+import glob
+import os
+import pandas as pd
+
+# -----------------------------------
+# Write a Parquet copy next to every training session CSV.
+# The apps read the Parquet copy when it exists, rerun this after adding or changing a session:
+#   python "HIK streamlit app scripts/convert_training_to_parquet.py"
+# -----------------------------------
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSIONS = os.path.join(REPO_ROOT, "25_26", "Training_Sessions", "*", "*.csv")
+
+# Same column types the apps parse the CSVs with
+SCHEMA = {"code": "category", "start": "float32", "end": "float32"}
+
+for csv_path in sorted(glob.glob(SESSIONS)):
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    df = pd.read_csv(csv_path, engine="pyarrow", dtype=SCHEMA)
+    df.to_parquet(parquet_path, index=False)
+    print(f"{os.path.relpath(csv_path, REPO_ROOT)} -> {os.path.basename(parquet_path)}")
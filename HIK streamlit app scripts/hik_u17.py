@@ -1,15 +1,60 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
 import base64
-import plotly.graph_objects as go
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from diskcache import Cache
+from typing import NamedTuple
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_DOWNLOAD_WORKERS = 16
+# Seconds to wait for GitHub to connect or send more data before a download is reported as failed
+DOWNLOAD_TIMEOUT = 10
+
+# Known column types of the exported CSVs, the pyarrow parser skips inferring them.
+# Timecodes fit in float32 and the few distinct codes are stored once as categories
+_SCHEMA = {"code": "category", "start": "float32", "end": "float32"}
+
+# Matchday files are named after their round, e.g. "#12.csv"
+_ROUND_RE = re.compile(r"#(\d+)\.csv$")
+
+# Layout shared by the charts, and a chart config without the plotly toolbar
+BASE_LAYOUT = {"template": "plotly_white"}
+CHART_CONFIG = {"displayModeBar": False}
+
+# Match sequence codes, split into on and off the ball phases
+SEQUENCE_CODES = (
+    "Build Up", "Breakthrough", "Afslutningsspillet", "Off Transition",
+    "Defend the box", "Low", "Medium", "High", "Def Transition"
+)
+ON_BALL_CODES = ("Build Up", "Breakthrough", "Afslutningsspillet")
+OFF_BALL_CODES = ("Defend the box", "Low", "Medium", "High", "Def Transition")
+
+# Training session blocks and the categories timed inside each block
+TRAINING_BLOCKS = ("Warm Up (S)", "Block 1 (S)", "Block 2 (S)", "Block 3 (S)", "Block 4 (S)", "Block 5 (S)", "Individual (S)")
+TRAINING_CATEGORIES = ("Organization", "Coaching", "Active")
+
+# Shared HTTP session, keeps the connections to GitHub alive between downloads.
+# Every rerun executes the script anew, so it is created once as a cached resource
+@st.cache_resource
+def _session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_DOWNLOAD_WORKERS))
+    return session
 
 # Cache helper functions
 @st.cache_data
 def get_base64_of_bin_file(bin_file):
-    response = requests.get(bin_file)
-    data = response.content
-    return base64.b64encode(data).decode()
+    with _session().get(bin_file, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raw.decode_content = True
+        return base64.b64encode(response.raw.read()).decode()
 
 # Background styling
 def set_png_as_page_bg(png_file):
@@ -25,186 +70,306 @@ def set_png_as_page_bg(png_file):
     '''
     st.markdown(page_bg_img, unsafe_allow_html=True)
 
+# Last ETag and parsed frame per CSV, shared by all sessions
+@st.cache_resource
+def _csv_store():
+    return {}
+
 # Fetch CSV from GitHub API or raw link
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 def load_csv_from_github(url):
+    store = _csv_store()
+    etag, cached_df = store.get(url, (None, None))
     try:
-        return pd.read_csv(url)
+        # Revalidate with the last ETag, an unchanged file comes back as an empty 304
+        headers = {"If-None-Match": etag} if etag else {}
+        # Parse straight from the socket instead of buffering the whole body first
+        with _session().get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 304:
+                return cached_df.copy()
+            response.raise_for_status()
+            if url.endswith(".parquet"):
+                # Parquet needs a seekable file, the compressed columns are small enough to buffer
+                df = pd.read_parquet(io.BytesIO(response.content))
+            else:
+                response.raw.decode_content = True
+                df = pd.read_csv(response.raw, engine="pyarrow", dtype=_SCHEMA)
     except Exception as e:
         st.error(f"Could not load {url}. Error: {e}")
         return None
+    # The stored frame is shared by all sessions, callers get their own copy to modify
+    store[url] = (response.headers.get("ETag"), df.copy())
+    return df
 
-# Fetch all available files in a folder using GitHub API
+# ETag of the last download of a CSV, it changes whenever the file content does
+def _csv_etag(url):
+    return _csv_store().get(url, (None, None))[0]
+
+# Parse an uploaded file once, widget changes rerun the page with the same bytes
 @st.cache_data
+def load_uploaded_file(data, file_name):
+    if file_name.endswith(".parquet"):
+        df = pd.read_parquet(io.BytesIO(data))
+    else:
+        df = pd.read_csv(io.BytesIO(data), engine="pyarrow")
+
+    # The export has ~100 per-player stat columns, narrower types halve what every rerun copies and sends
+    float_cols = df.select_dtypes("float").columns
+    int_cols = df.select_dtypes("integer").columns
+    df[float_cols] = df[float_cols].apply(pd.to_numeric, downcast="float")
+    df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast="integer")
+    return df
+
+# Folder listings are also kept on disk for an hour, so they survive app restarts
+# instead of spending another GitHub API call from the rate limit. The cache is opened
+# once as a cached resource rather than reconnecting to its database on every rerun
+@st.cache_resource
+def _listing_cache():
+    return Cache(os.path.join(tempfile.gettempdir(), "gh_cache"))
+
+def _list_dir(api_url):
+    listing_cache = _listing_cache()
+    names = listing_cache.get(api_url)
+    if names is not None:
+        return names
+
+    # Revalidate an expired listing with its ETag, GitHub does not count 304 answers against the rate limit
+    etag, names = listing_cache.get(("etag", api_url), (None, None))
+    headers = {"Accept": "application/vnd.github+json"}
+    if etag:
+        headers["If-None-Match"] = etag
+    response = _session().get(api_url, headers=headers, timeout=5)
+    if response.status_code != 304:
+        response.raise_for_status()
+        names = [f["name"] for f in response.json()]
+        listing_cache.set(("etag", api_url), (response.headers.get("ETag"), names))
+    listing_cache.set(api_url, names, expire=3600)
+    return names
+
+# Sessions converted by convert_training_to_parquet.py are read from their Parquet copy
+def _prefer_parquet(files):
+    converted = {f.removesuffix(".parquet") for f in files if f.endswith(".parquet")}
+    return [
+        f.removesuffix(".csv") + ".parquet" if f.removesuffix(".csv") in converted else f
+        for f in files if f.endswith(".csv")
+    ]
+
+# Fetch all available files in a folder using GitHub API
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_available_files(team_choice):
     api_url = f"https://api.github.com/repos/Vangelis19/DBU-Divisionen/contents/25_26/Matchdays/{team_choice}"
-    response = requests.get(api_url)
-    if response.status_code == 200:
-        files = response.json()
-        csv_files = [f["name"] for f in files if f["name"].endswith(".csv") and f["name"].startswith("#")]
-        return csv_files
-    else:
-        st.error(f"Could not access GitHub API for {team_choice}. Error code: {response.status_code}")
+    try:
+        files = _list_dir(api_url)
+    except requests.HTTPError as e:
+        st.error(f"Could not access GitHub API for {team_choice}. Error code: {e.response.status_code}")
         return []
+    except requests.RequestException as e:
+        st.error(f"Could not access GitHub API for {team_choice}. Error: {e}")
+        return []
+    return [f for f in files if _ROUND_RE.match(f)]
+
+# Per-round summary shared by every match visualization
+class RoundsData(NamedTuple):
+    combined_df: pd.DataFrame
+    active_times: pd.Series
+    dead_times: pd.Series
+    total_times: pd.Series
+    rounds: list
+    pivot: pd.DataFrame
+    source: tuple
+
+# Times are averaged over the number of files when several rounds are combined,
+# source holds the ETags of the files the rounds were read from
+def summarize_rounds(combined_df, source, n_files=1):
+    # Sort the rounds once, the ordered categorical keeps them in order from here on
+    rounds = sorted(combined_df["ROUND"].unique())
+    combined_df["ROUND"] = pd.Categorical(combined_df["ROUND"], categories=rounds, ordered=True)
+
+    # Total seconds per round and code in one pass, every chart reads from this
+    duration = combined_df["end"] - combined_df["start"]
+    pivot = duration.groupby([combined_df["ROUND"], combined_df["code"]], observed=True).sum().unstack("code", fill_value=0)
+    sequence_times = pivot.reindex(columns=["Active", "Dead"], fill_value=0) / n_files
+    active_times = sequence_times["Active"]
+    dead_times = sequence_times["Dead"]
+    total_times = active_times.add(dead_times, fill_value=0)
+    return RoundsData(combined_df, active_times, dead_times, total_times, rounds, pivot, source)
 
-# Page 1: Match Analysis Stats
-def match_analysis_page():
-    st.subheader("Match Analysis Stats")
-
-    team_choice = st.selectbox("Select Team", ["U17", "U19"])
-    round_options = list(range(1, 31)) + ["All rounds"]
-    round_choice = st.selectbox("Select Round", round_options)
+# Load every available round for a team
+def load_all_rounds(team_choice):
+    available_files = get_available_files(team_choice)
+    if not available_files:
+        st.warning("No CSV files found in the GitHub repo for this team.")
+        return None
+    return combine_rounds(team_choice, tuple(sorted(available_files)))
 
+# The combined rounds are kept per team and file list and handed out by reference
+# instead of being unpickled on every rerun, callers must treat them as read-only
+@st.cache_resource(ttl=3600)
+def combine_rounds(team_choice, files):
     base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Matchdays/{team_choice}"
-    dfs = []
-
-    if round_choice == "All rounds":
-        available_files = get_available_files(team_choice)
-        if not available_files:
-            st.warning("No CSV files found in the GitHub repo for this team.")
-            return
-
-        for file in available_files:
-            file_url = f"{base_url}/{file.replace('#','%23')}"
-            df = load_csv_from_github(file_url)
-            if df is not None:
-                df["ROUND"] = int(file.strip(".csv").replace("#",""))
-                dfs.append(df)
-
-        if dfs:
-            combined_df = pd.concat(dfs, ignore_index=True)
-            st.dataframe(combined_df)
-        else:
-            st.warning("No valid CSV files could be loaded.")
-            return
-    else:
-        csv_url = f"{base_url}/%23{round_choice}.csv"
-        df = load_csv_from_github(csv_url)
-        if df is not None:
-            df["ROUND"] = round_choice
-            combined_df = df
-            st.dataframe(combined_df)
-        else:
-            return
 
-    def compute_sequence_time(df, sequence_type):
-        seq_df = df[df["code"] == sequence_type].copy()
-        seq_df["DURATION"] = seq_df["end"] - seq_df["start"]
-        return seq_df.groupby("ROUND")["DURATION"].sum()
+    def fetch_round(file):
+        file_url = f"{base_url}/{quote(file)}"
+        return int(_ROUND_RE.match(file).group(1)), load_csv_from_github(file_url), _csv_etag(file_url)
 
-    active_times = compute_sequence_time(combined_df, "Active")
-    dead_times = compute_sequence_time(combined_df, "Dead")
-
-    if round_choice == "All rounds":
-        n_files = len(get_available_files(team_choice))
-        active_times = active_times / n_files
-        dead_times = dead_times / n_files
+    # Download the rounds concurrently, each fetch is mostly waiting on the network
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        results = list(executor.map(fetch_round, files))
 
-    rounds = sorted(combined_df["ROUND"].unique())
+    dfs = []
+    for round_number, df, _ in results:
+        if df is not None:
+            df["ROUND"] = round_number
+            dfs.append(df)
 
-    fig1 = go.Figure()
-    fig1.add_trace(go.Bar(
-        x=rounds,
-        y=[active_times.get(r, 0)/60 for r in rounds],
-        name="Active",
-        marker_color="green",
-        text=[f"{round(active_times.get(r, 0)/60, 1)} min" for r in rounds],
-        textposition='auto'
-    ))
-    fig1.add_trace(go.Bar(
-        x=rounds,
-        y=[dead_times.get(r, 0)/60 for r in rounds],
-        name="Dead",
-        marker_color="lightcoral",
-        text=[f"{round(dead_times.get(r, 0)/60, 1)} min" for r in rounds],
-        textposition='auto'
-    ))
+    if not dfs:
+        st.warning("No valid CSV files could be loaded.")
+        return None
+    combined_df = pd.concat(dfs, ignore_index=True)
+    # Concatenating categoricals with different categories falls back to object
+    combined_df["code"] = combined_df["code"].astype("category")
+    source = tuple(zip(files, (etag for _, _, etag in results)))
+    return summarize_rounds(combined_df, source, len(files))
+
+# A single round is summarized once per team and round, reruns reuse its pivot
+@st.cache_resource(ttl=3600)
+def load_round(team_choice, round_choice):
+    base_url = f"https://raw.githubusercontent.com/Vangelis19/DBU-Divisionen/main/25_26/Matchdays/{team_choice}"
+    file_url = f"{base_url}/%23{round_choice}.csv"
+    df = load_csv_from_github(file_url)
+    if df is None:
+        return None
+    df["ROUND"] = round_choice
+    return summarize_rounds(df, _csv_etag(file_url))
+
+# Figures only depend on the team, round and the files behind them, reruns with the same selection reuse them
+@st.cache_resource(ttl=3600)
+def build_match_figures(team_choice, round_choice, source, _data):
+    # Imported on first use, the player page never loads plotly
+    import plotly.graph_objects as go
+    active_times, dead_times, total_times, rounds = _data.active_times, _data.dead_times, _data.total_times, _data.rounds
+
+    active_minutes = (active_times.reindex(rounds, fill_value=0) / 60).to_numpy()
+    dead_minutes = (dead_times.reindex(rounds, fill_value=0) / 60).to_numpy()
+
+    fig1 = go.Figure(data=[
+        go.Bar(
+            x=rounds,
+            y=active_minutes,
+            name="Active",
+            marker_color="green",
+            text=np.char.add(np.round(active_minutes, 1).astype(str), " min"),
+            textposition='auto'
+        ),
+        go.Bar(
+            x=rounds,
+            y=dead_minutes,
+            name="Dead",
+            marker_color="lightcoral",
+            text=np.char.add(np.round(dead_minutes, 1).astype(str), " min"),
+            textposition='auto'
+        )
+    ])
     fig1.update_layout(
         title="Total Active vs Dead Sequence Time per Round (minutes)",
         xaxis_title="Round",
         yaxis_title="Time (minutes)",
         barmode="group",
-        template="plotly_white"
+        **BASE_LAYOUT
     )
-    st.plotly_chart(fig1)
 
-    total_times = active_times.add(dead_times, fill_value=0)
-    active_pct = [100 * active_times.get(r, 0)/total_times.get(r, 1) for r in rounds]
-    dead_pct = [100 * dead_times.get(r, 0)/total_times.get(r, 1) for r in rounds]
-
-    fig2 = go.Figure()
-    fig2.add_trace(go.Bar(
-        x=rounds,
-        y=active_pct,
-        name="Active",
-        marker_color="green",
-        text=[f"{round(p,1)}%" for p in active_pct],
-        textposition='inside'
-    ))
-    fig2.add_trace(go.Bar(
-        x=rounds,
-        y=dead_pct,
-        name="Dead",
-        marker_color="lightcoral",
-        text=[f"{round(p,1)}%" for p in dead_pct],
-        textposition='inside'
-    ))
+    # A round without any sequence time shows 0%, divide it by 1 instead of 0
+    total = total_times.reindex(rounds, fill_value=0).replace(0, 1).to_numpy()
+    active_pct = 100 * active_times.reindex(rounds, fill_value=0).to_numpy() / total
+    dead_pct = 100 * dead_times.reindex(rounds, fill_value=0).to_numpy() / total
+
+    fig2 = go.Figure(data=[
+        go.Bar(
+            x=rounds,
+            y=active_pct,
+            name="Active",
+            marker_color="green",
+            text=np.char.add(np.round(active_pct, 1).astype(str), "%"),
+            textposition='inside'
+        ),
+        go.Bar(
+            x=rounds,
+            y=dead_pct,
+            name="Dead",
+            marker_color="lightcoral",
+            text=np.char.add(np.round(dead_pct, 1).astype(str), "%"),
+            textposition='inside'
+        )
+    ])
     fig2.update_layout(
         title="Percentage of Active vs Dead Sequence Time per Round",
         xaxis_title="Round",
         yaxis_title="Percentage (%)",
         barmode="stack",
-        template="plotly_white"
+        **BASE_LAYOUT
     )
-    st.plotly_chart(fig2)
-
-    def active_time_distribution(df):
-        sequence_codes = [
-            "Build Up", "Breakthrough", "Afslutningsspillet", "Off Transition",
-            "Defend the box", "Low", "Medium", "High", "Def Transition"
-        ]
-        active_df = df[df["code"].isin(sequence_codes)].copy()
-        active_df["DURATION"] = active_df["end"] - active_df["start"]
-        distribution = active_df.groupby("code")["DURATION"].sum() / 60
-        fig = go.Figure(go.Pie(labels=distribution.index, values=distribution.values))
-        fig.update_layout(title="Active Time Distribution (minutes)", template="plotly_white")
-        st.plotly_chart(fig)
-
-    active_time_distribution(combined_df)
-
-    def on_off_total_time(df):
-        on_ball_codes = ["Build Up", "Breakthrough", "Afslutningsspillet"]
-        off_ball_codes = ["Defend the box", "Low", "Medium", "High", "Def Transition"]
-        df["DURATION"] = df["end"] - df["start"]
-        on_ball_time = df[df["code"].isin(on_ball_codes)]["DURATION"].sum() / 60
-        off_ball_time = df[df["code"].isin(off_ball_codes)]["DURATION"].sum() / 60
-        fig = go.Figure(go.Pie(labels=["On the Ball", "Off the Ball"], values=[on_ball_time, off_ball_time]))
-        fig.update_layout(title="On vs Off the Ball Total Time (minutes)", template="plotly_white")
-        st.plotly_chart(fig)
-
-    on_off_total_time(combined_df)
-
-    def on_ball_distribution(df):
-        on_ball_codes = ["Build Up", "Breakthrough", "Afslutningsspillet"]
-        df["DURATION"] = df["end"] - df["start"]
-        on_df = df[df["code"].isin(on_ball_codes)].copy()
-        distribution = on_df.groupby("code")["DURATION"].sum() / 60
-        fig = go.Figure(go.Pie(labels=distribution.index, values=distribution.values))
-        fig.update_layout(title="On the Ball Time Distribution (minutes)", template="plotly_white")
-        st.plotly_chart(fig)
-
-    on_ball_distribution(combined_df)
-
-    def off_ball_distribution(df):
-        off_ball_codes = ["Defend the box", "Low", "Medium", "High", "Def Transition"]
-        df["DURATION"] = df["end"] - df["start"]
-        off_df = df[df["code"].isin(off_ball_codes)].copy()
-        distribution = off_df.groupby("code")["DURATION"].sum() / 60
-        fig = go.Figure(go.Pie(labels=distribution.index, values=distribution.values))
-        fig.update_layout(title="Off the Ball Time Distribution (minutes)", template="plotly_white")
-        st.plotly_chart(fig)
-
-    off_ball_distribution(combined_df)
+
+    # The pie charts only need each code's total over all rounds, sum the pivot once for all of them
+    code_minutes = _data.pivot.sum() / 60
+
+    def active_time_distribution(code_minutes):
+        # Plain labels and a NumPy array of values, plotly ships the values to the browser as a typed array
+        distribution = code_minutes[code_minutes.index.intersection(SEQUENCE_CODES)]
+        fig = go.Figure(go.Pie(labels=distribution.index.tolist(), values=distribution.to_numpy()))
+        fig.update_layout(title="Active Time Distribution (minutes)", **BASE_LAYOUT)
+        return fig
+
+    def on_off_total_time(code_minutes):
+        phases = ["On the Ball", "Off the Ball"]
+        # Label every code with its phase and sum the per-code minutes in one go
+        phase_of_code = dict.fromkeys(ON_BALL_CODES, phases[0]) | dict.fromkeys(OFF_BALL_CODES, phases[1])
+        phase_times = code_minutes.groupby(phase_of_code).sum().reindex(phases, fill_value=0)
+        fig = go.Figure(go.Pie(labels=phases, values=phase_times.to_numpy()))
+        fig.update_layout(title="On vs Off the Ball Total Time (minutes)", **BASE_LAYOUT)
+        return fig
+
+    def on_ball_distribution(code_minutes):
+        distribution = code_minutes[code_minutes.index.intersection(ON_BALL_CODES)]
+        fig = go.Figure(go.Pie(labels=distribution.index.tolist(), values=distribution.to_numpy()))
+        fig.update_layout(title="On the Ball Time Distribution (minutes)", **BASE_LAYOUT)
+        return fig
+
+    def off_ball_distribution(code_minutes):
+        distribution = code_minutes[code_minutes.index.intersection(OFF_BALL_CODES)]
+        fig = go.Figure(go.Pie(labels=distribution.index.tolist(), values=distribution.to_numpy()))
+        fig.update_layout(title="Off the Ball Time Distribution (minutes)", **BASE_LAYOUT)
+        return fig
+
+    return [
+        fig1,
+        fig2,
+        active_time_distribution(code_minutes),
+        on_off_total_time(code_minutes),
+        on_ball_distribution(code_minutes),
+        off_ball_distribution(code_minutes)
+    ]
+
+# Page 1: Match Analysis Stats
+def match_analysis_page():
+    st.subheader("Match Analysis Stats")
+
+    team_choice = st.selectbox("Select Team", ["U17", "U19"])
+    round_options = list(range(1, 31)) + ["All rounds"]
+    round_choice = st.selectbox("Select Round", round_options)
+
+    if round_choice == "All rounds":
+        data = load_all_rounds(team_choice)
+    else:
+        data = load_round(team_choice, round_choice)
+    if data is None:
+        return
+
+    combined_df = data.combined_df
+    st.dataframe(combined_df)
+
+    for fig in build_match_figures(team_choice, round_choice, data.source, data):
+        st.plotly_chart(fig, config=CHART_CONFIG)
 
 # Page 2: Training Analysis Stats
 def training_analysis_page():
@@ -219,133 +384,122 @@ def training_analysis_page():
         return
 
     file_choice = st.selectbox("Select Training File", available_files)
-    file_url = f"{base_url}/{file_choice.replace(' ', '%20')}"
+    file_url = f"{base_url}/{quote(file_choice)}"
     df = load_csv_from_github(file_url)
     if df is None:
         return
 
     st.dataframe(df)
 
-    training_visualizations(df)
+    training_visualizations(team_choice, file_choice, _csv_etag(file_url), df)
 
-@st.cache_data
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_available_files_training(team_choice):
     api_url = f"https://api.github.com/repos/Vangelis19/DBU-Divisionen/contents/25_26/Training_Sessions/{team_choice}"
-    response = requests.get(api_url)
-    if response.status_code == 200:
-        files = response.json()
-        csv_files = [f["name"] for f in files if f["name"].endswith(".csv")]
-        return csv_files
-    else:
+    try:
+        files = _list_dir(api_url)
+    except requests.RequestException:
         return []
+    return _prefer_parquet(files)
+
+# Training figures only depend on the team, file and its ETag, reruns with the same selection reuse them
+@st.cache_resource(ttl=3600)
+def build_training_figures(team_choice, file_choice, etag, _df):
+    # Imported on first use, the player page never loads plotly
+    import plotly.graph_objects as go
+    # Sessions without any block rows have nothing to chart, skip the aggregation
+    if not _df["code"].isin(TRAINING_BLOCKS).any():
+        return None
+
+    # Seconds per row, computed once and reused by every chart below
+    duration = _df["end"].to_numpy() - _df["start"].to_numpy()
+
+    # Seconds per code in a single pass: each row adds its duration to the bin of its code
+    code_order = TRAINING_BLOCKS + ("Session (S)",) + TRAINING_CATEGORIES
+    code_ids = pd.Categorical(_df["code"], categories=code_order).codes
+    totals = np.bincount(code_ids + 1, weights=duration, minlength=len(code_order) + 1)[1:] / 60
+
+    # Blocks, session and categories are consecutive slices of the totals
+    n_blocks = len(TRAINING_BLOCKS)
+    block_minutes = totals[:n_blocks]
+    category_minutes = totals[n_blocks + 1:]
+
+    fig_pie = go.Figure(go.Pie(labels=TRAINING_BLOCKS, values=block_minutes))
+    fig_pie.update_layout(title="Training Time Distribution by Block (minutes)", **BASE_LAYOUT)
+
+    total_blocks_time = block_minutes.sum()
+    session_time = totals[n_blocks]
 
-def training_visualizations(df):
-    blocks = ["Warm Up (S)", "Block 1 (S)", "Block 2 (S)", "Block 3 (S)", "Block 4 (S)", "Block 5 (S)", "Individual (S)"]
-    durations_minutes = {}
-    for block in blocks:
-        block_df = df[df["code"] == block].copy()
-        block_df["duration_sec"] = block_df["end"] - block_df["start"]
-        durations_minutes[block] = block_df["duration_sec"].sum() / 60
-
-    fig_pie = go.Figure(go.Pie(labels=list(durations_minutes.keys()), values=list(durations_minutes.values())))
-    fig_pie.update_layout(title="Training Time Distribution by Block (minutes)", template="plotly_white")
-    st.plotly_chart(fig_pie)
-
-    total_blocks_time = sum(durations_minutes.values())
-    session_df = df[df["code"] == "Session (S)"].copy()
-    session_df["duration_sec"] = session_df["end"] - session_df["start"]
-    session_time = session_df["duration_sec"].sum() / 60
-
-    fig_bar = go.Figure()
-    fig_bar.add_trace(go.Bar(x=["Blocks Total"], y=[total_blocks_time], text=[f"{round(total_blocks_time,1)} min"], textposition="auto"))
-    fig_bar.add_trace(go.Bar(x=["Session (S)"], y=[session_time], text=[f"{round(session_time,1)} min"], textposition="auto"))
-    fig_bar.update_layout(title="Total Blocks Time vs Session Time (minutes)", template="plotly_white")
-    st.plotly_chart(fig_bar)
-
-    categories = ["Organization", "Coaching", "Active"]
-    category_minutes = {}
-    for cat in categories:
-        cat_df = df[df["code"] == cat].copy()
-        cat_df["duration_sec"] = cat_df["end"] - cat_df["start"]
-        category_minutes[cat] = cat_df["duration_sec"].sum() / 60
+    fig_bar = go.Figure(data=[
+        go.Bar(x=["Blocks Total"], y=[total_blocks_time], text=[f"{round(total_blocks_time,1)} min"], textposition="auto"),
+        go.Bar(x=["Session (S)"], y=[session_time], text=[f"{round(session_time,1)} min"], textposition="auto")
+    ])
+    fig_bar.update_layout(title="Total Blocks Time vs Session Time (minutes)", **BASE_LAYOUT)
 
     fig_cat = go.Figure(go.Bar(
-        x=list(category_minutes.keys()),
-        y=list(category_minutes.values()),
-        text=[f"{round(v,1)} min" for v in category_minutes.values()],
+        x=TRAINING_CATEGORIES,
+        y=category_minutes,
+        text=[f"{round(v,1)} min" for v in category_minutes],
         textposition="auto",
         marker_color=["orange", "blue", "green"]
     ))
-    fig_cat.update_layout(title="Organization vs Coaching vs Active Time (minutes)", yaxis_title="Minutes", template="plotly_white")
-    st.plotly_chart(fig_cat)
-
-    # Grouped bar chart
-    categories = ["Organization", "Coaching", "Active"]
-    data_by_block = {cat: [] for cat in categories}
-    for block in blocks:
-        for cat in categories:
-            block_cat_df = df[(df["parent"] == block) & (df["code"] == cat)].copy()
-            block_cat_df["duration_sec"] = block_cat_df["end"] - block_cat_df["start"]
-            data_by_block[cat].append(block_cat_df["duration_sec"].sum() / 60)
-
-    fig_grouped = go.Figure()
-    for cat in categories:
-        fig_grouped.add_trace(go.Bar(x=blocks, y=data_by_block[cat], name=cat))
-    fig_grouped.update_layout(
-        title="Organization, Coaching, and Active Time per Block (minutes)",
-        yaxis_title="Minutes",
-        barmode="group",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_grouped)    # --- Grouped Bar Chart: Organization, Coaching, Active by Block ---
-    blocks = [
-        "Warm Up (S)", "Block 1 (S)", "Block 2 (S)",
-        "Block 3 (S)", "Block 4 (S)", "Block 5 (S)",
-        "Individual (S)"
-    ]
-    categories = ["Organization", "Coaching", "Active"]
+    fig_cat.update_layout(title="Organization vs Coaching vs Active Time (minutes)", yaxis_title="Minutes", **BASE_LAYOUT)
 
-    data_by_block = {cat: [] for cat in categories}
+    figures = [fig_pie, fig_bar, fig_cat]
 
-    for block in blocks:
-        for cat in categories:
-            block_cat_df = df[df["code"].str.contains(block) & df["code"].str.contains(cat)].copy()
-            if not block_cat_df.empty:
-                block_cat_df["duration_sec"] = block_cat_df["end"] - block_cat_df["start"]
-                data_by_block[cat].append(block_cat_df["duration_sec"].sum() / 60)
-            else:
-                data_by_block[cat].append(0)
+    # Grouped bar chart, needs the parent block of every row
+    if "parent" not in _df.columns:
+        return figures
 
-    fig_grouped = go.Figure()
-    for cat in categories:
-        fig_grouped.add_trace(go.Bar(x=blocks, y=data_by_block[cat], name=cat))
+    # Seconds per (parent block, category) in one grouped pass instead of a mask per cell
+    data_by_block = (
+        pd.Series(duration, index=_df.index)
+        .groupby([_df["parent"], _df["code"]], observed=True)
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=TRAINING_BLOCKS, columns=TRAINING_CATEGORIES, fill_value=0)
+    ) / 60
 
+    fig_grouped = go.Figure(data=[go.Bar(x=TRAINING_BLOCKS, y=data_by_block[cat].to_numpy(), name=cat) for cat in TRAINING_CATEGORIES])
     fig_grouped.update_layout(
         title="Organization, Coaching, and Active Time per Block (minutes)",
         yaxis_title="Minutes",
         barmode="group",
-        template="plotly_white"
+        **BASE_LAYOUT
     )
-    st.plotly_chart(fig_grouped)
+    figures.append(fig_grouped)
+    return figures
+
+def training_visualizations(team_choice, file_choice, etag, df):
+    figures = build_training_figures(team_choice, file_choice, etag, df)
+    if figures is None:
+        st.info("No training blocks found in this file.")
+        return
+    for fig in figures:
+        st.plotly_chart(fig, config=CHART_CONFIG)
 
 
 # Page 3: Player Data Explorer
 def player_data_page():
     st.subheader("Player Data Explorer")
-    csv_file = st.file_uploader("Upload a CSV file", type=["csv"])
-    if csv_file is not None:
-        df = pd.read_csv(csv_file)
-        df["TEAM_FILTER"] = df["TEAMNAME"].str.replace("U17", "", regex=False).str.strip()
-        team_options = ["ALL"] + sorted(df["TEAM_FILTER"].unique().tolist())
+    uploaded_file = st.file_uploader("Upload a CSV or Parquet file", type=["csv", "parquet"])
+    if uploaded_file is not None:
+        df = load_uploaded_file(uploaded_file.getvalue(), uploaded_file.name)
+        # Only a handful of teams and positions, as categories the filters compare integer codes
+        df["TEAM_FILTER"] = df["TEAMNAME"].str.replace("U17", "", regex=False).str.strip().astype("category")
+        df["POSITION"] = df["POSITION"].astype("category")
+        # The categories are the sorted distinct values, no scan of the column needed
+        team_options = ["ALL"] + df["TEAM_FILTER"].cat.categories.tolist()
         team_choice = st.selectbox("Select Team", team_options)
-        position_options = ["ALL"] + sorted(df["POSITION"].unique().tolist())
+        position_options = ["ALL"] + df["POSITION"].cat.categories.tolist()
         position_choice = st.selectbox("Select Position", position_options)
-        filtered_df = df.copy()
+        # Both filters go into one mask, so the rows are selected in a single pass
+        mask = np.ones(len(df), dtype=bool)
         if team_choice != "ALL":
-            filtered_df = filtered_df[filtered_df["TEAM_FILTER"] == team_choice]
+            mask &= (df["TEAM_FILTER"] == team_choice).to_numpy()
         if position_choice != "ALL":
-            filtered_df = filtered_df[filtered_df["POSITION"] == position_choice]
-        st.dataframe(filtered_df)
+            mask &= (df["POSITION"] == position_choice).to_numpy()
+        st.dataframe(df if mask.all() else df[mask])
 
 # Main App
 def main():